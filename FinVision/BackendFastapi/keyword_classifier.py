@@ -0,0 +1,88 @@
+# keyword_classifier.py
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_CATEGORY = "Others"
+
+# A keyword table snapshot: ((category, (keyword, ...)), ...) in table order
+TableSignature = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+
+def _table_signature(categories: Dict[str, List[str]]) -> TableSignature:
+    return tuple((category, tuple(keywords)) for category, keywords in categories.items())
+
+
+class KeywordClassifier:
+    """
+    Classifies product names by compiling a {category: [KEYWORD, ...]} table
+    into a single token trie.
+
+    A keyword matches when its words appear as a contiguous run of whole words
+    in the upper-cased product name (the old " {keyword} " padded search).
+    When several categories match, the one listed first in the table wins.
+    """
+
+    def __init__(self, categories: Dict[str, List[str]], default_category: str = DEFAULT_CATEGORY):
+        self.categories = categories
+        self.default_category = default_category
+        self._signature: Optional[TableSignature] = None
+        self._category_names: List[str] = []
+        self._trie: Dict[str, list] = {}
+        self.compile()
+
+    def compile(self) -> None:
+        """(Re)builds the trie from the current contents of the keyword table."""
+        signature = _table_signature(self.categories)
+        category_names: List[str] = []
+        # Each trie node is [best_rank, children]; best_rank is the table position
+        # of the first category owning a keyword that ends at this node.
+        root: Dict[str, list] = {}
+        for category, keywords in signature:
+            if category == self.default_category:
+                continue
+            rank = len(category_names)
+            category_names.append(category)
+            for keyword in keywords:
+                tokens = keyword.split(' ')
+                children = root
+                node = None
+                for token in tokens:
+                    node = children.get(token)
+                    if node is None:
+                        node = [None, {}]
+                        children[token] = node
+                    children = node[1]
+                if node is not None and (node[0] is None or rank < node[0]):
+                    node[0] = rank
+        self._category_names = category_names
+        self._trie = root
+        self._signature = signature
+
+    def refresh(self) -> bool:
+        """Recompiles only if the keyword table changed since the last compile."""
+        if _table_signature(self.categories) == self._signature:
+            return False
+        self.compile()
+        return True
+
+    def classify(self, product_name: str) -> str:
+        """Returns the category for a product name, or the default category."""
+        tokens = product_name.upper().split(' ')
+        root = self._trie
+        best_rank: Optional[int] = None
+        token_count = len(tokens)
+        for start in range(token_count):
+            node = root.get(tokens[start])
+            position = start
+            while node is not None:
+                rank = node[0]
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best_rank = rank
+                    if rank == 0:
+                        return self._category_names[0]
+                position += 1
+                if position == token_count:
+                    break
+                node = node[1].get(tokens[position])
+        if best_rank is None:
+            return self.default_category
+        return self._category_names[best_rank]
@@ -0,0 +1,152 @@
+# llm_gateway.py
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict
+
+DEFAULT_MODEL = "gemini-1.5-flash"
+
+
+class GatewayOverloaded(Exception):
+    """Raised instead of queueing when the gateway is saturated."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class LLMGateway:
+    """
+    Single entry point for LLM calls: keeps one long-lived client per model
+    name and bounds how many calls are in flight at once.
+
+    Callers beyond `max_concurrency` wait in a queue. Once `max_queue` callers
+    are waiting, new ones are rejected with 429; a caller that waits longer than
+    `queue_timeout` seconds for a slot is rejected with 503.
+
+    `model_factory(model_name)` builds a client exposing
+    `generate_content_async(prompt, **kwargs)`, e.g. genai.GenerativeModel or a
+    local fake in tests.
+    """
+
+    def __init__(self, model_factory: Callable[[str], Any], max_concurrency: int = 4,
+                 max_queue: int = 16, queue_timeout: float = 5.0, sample_size: int = 1000):
+        self.model_factory = model_factory
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._models: Dict[str, Any] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._waiting = 0
+        self._in_flight = 0
+        self._queue_times: Deque[float] = deque(maxlen=sample_size)
+        self._counters = {"calls": 0, "completed": 0, "failed": 0, "cancelled": 0, "rejected_queue_full": 0, "rejected_queue_timeout": 0}
+        self._queue_time_count = 0
+        self._queue_time_total = 0.0
+        self._queue_time_max = 0.0
+
+    def model(self, model_name: str = DEFAULT_MODEL) -> Any:
+        """Returns the shared client for a model name, creating it on first use."""
+        client = self._models.get(model_name)
+        if client is None:
+            client = self._models[model_name] = self.model_factory(model_name)
+        return client
+
+    @asynccontextmanager
+    async def slot(self):
+        """Holds one of the `max_concurrency` call slots for the duration of the block."""
+        self._counters["calls"] += 1
+        if self._waiting + self._in_flight >= self.max_concurrency + self.max_queue:
+            self._counters["rejected_queue_full"] += 1
+            raise GatewayOverloaded(429, "Too many AI requests are queued. Please retry shortly.", retry_after=1)
+
+        queued_at = time.perf_counter()
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._counters["rejected_queue_timeout"] += 1
+            raise GatewayOverloaded(503, "AI service is at capacity. Please retry shortly.",
+                                    retry_after=max(1, round(self.queue_timeout)))
+        finally:
+            self._waiting -= 1
+        self._record_queue_time(time.perf_counter() - queued_at)
+
+        self._in_flight += 1
+        try:
+            yield
+            self._counters["completed"] += 1
+        except (asyncio.CancelledError, GeneratorExit):
+            self._counters["cancelled"] += 1
+            raise
+        except BaseException:
+            self._counters["failed"] += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    async def generate(self, prompt: str, model_name: str = DEFAULT_MODEL, timeout: float = 30.0, **kwargs) -> Any:
+        """
+        Runs generate_content_async through a slot. The timeout covers only the
+        upstream call, not time spent queueing; asyncio.TimeoutError propagates.
+        """
+        async with self.slot():
+            return await asyncio.wait_for(self.model(model_name).generate_content_async(prompt, **kwargs), timeout=timeout)
+
+    async def stream(self, prompt: str, model_name: str = DEFAULT_MODEL, timeout: float = 30.0, **kwargs) -> AsyncIterator[Any]:
+        """
+        Yields response chunks from generate_content_async(stream=True), holding a
+        slot until the stream ends or the consumer closes it (which also closes the
+        upstream stream). `timeout` bounds the whole generation.
+        """
+        async with self.slot():
+            deadline = asyncio.get_running_loop().time() + timeout
+
+            def remaining() -> float:
+                return max(0.0, deadline - asyncio.get_running_loop().time())
+
+            response = await asyncio.wait_for(
+                self.model(model_name).generate_content_async(prompt, stream=True, **kwargs), timeout=remaining())
+            chunks = response.__aiter__()
+            try:
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), timeout=remaining())
+                    except StopAsyncIteration:
+                        return
+                    yield chunk
+            finally:
+                aclose = getattr(chunks, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+
+    def _record_queue_time(self, seconds: float) -> None:
+        self._queue_times.append(seconds)
+        self._queue_time_count += 1
+        self._queue_time_total += seconds
+        self._queue_time_max = max(self._queue_time_max, seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load, counters and queue-time figures (seconds)."""
+        recent = sorted(self._queue_times)
+
+        def percentile(p: float) -> float:
+            return recent[min(len(recent) - 1, int(p * len(recent)))] if recent else 0.0
+
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            **self._counters,
+            "queue_time": {
+                "mean": self._queue_time_total / self._queue_time_count if self._queue_time_count else 0.0,
+                "max": self._queue_time_max,
+                "p50_recent": percentile(0.50),
+                "p95_recent": percentile(0.95),
+            },
+        }
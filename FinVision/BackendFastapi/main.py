@@ -1,16 +1,24 @@
 # main.py
 import os
 import google.generativeai as genai
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.background import BackgroundTask
+from starlette.requests import ClientDisconnect
 from pydantic import BaseModel, Field
-from typing import Dict, Any, List, Union, Optional
+from typing import Dict, Any, AsyncIterator, Iterable, Iterator, List, Union, Optional, Tuple
 from dotenv import load_dotenv
 import asyncio
+import codecs
 import json
 # import re # Removed - Not needed for this simple parsing
 import traceback
+from concurrent.futures import ProcessPoolExecutor
+from keyword_classifier import KeywordClassifier
+from price_tokenizer import find_rightmost_price
+from llm_gateway import LLMGateway, GatewayOverloaded
+from response_cache import ResponseCache, MemoryCacheBackend, DiskCacheBackend, cache_key
 
 # --- Configuration & Initialization ---
 load_dotenv()
@@ -37,6 +45,35 @@ else:
         print(f"Error configuring Google Generative AI: {e}")
         api_key = None
 
+# Shared Gemini clients + limit on concurrent calls; beyond it requests queue, then get 429/503
+llm_gateway = LLMGateway(
+    genai.GenerativeModel,
+    max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "4")),
+    max_queue=int(os.getenv("LLM_MAX_QUEUE", "16")),
+    queue_timeout=float(os.getenv("LLM_QUEUE_TIMEOUT", "5")),
+)
+
+# Cache of Gemini answers keyed on the normalized prompt inputs ("memory" or "disk" backend)
+if os.getenv("LLM_CACHE_BACKEND", "memory") == "disk":
+    _cache_backend = DiskCacheBackend(os.getenv("LLM_CACHE_DIR", ".llm_cache"),
+                                      max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000")))
+else:
+    _cache_backend = MemoryCacheBackend(max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024")))
+response_cache = ResponseCache(_cache_backend, ttl=float(os.getenv("LLM_CACHE_TTL", "3600")))
+
+async def generate_text_cached(namespace: str, inputs: Any, prompt: str) -> str:
+    """Gemini text for a prompt, served from response_cache when the same inputs were seen before."""
+    async def generate() -> str:
+        response = await llm_gateway.generate(prompt, timeout=30.0)
+        return response.text
+    return await response_cache.get_or_compute(cache_key(namespace, inputs), generate)
+
+@app.exception_handler(GatewayOverloaded)
+async def gateway_overloaded_handler(request: Request, exc: GatewayOverloaded):
+    print(f"Shedding load on {request.url.path}: {exc.detail}")
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail},
+                        headers={"Retry-After": str(exc.retry_after)})
+
 # --- Pydantic Models ---
 # Ensure all class definitions start at column 0
 class FinancialDataInput(BaseModel):
@@ -60,6 +97,15 @@ class ParsedBillResponse(BaseModel):
     classified_products: List[ProductItem]
     final_amount: Union[float, None] = None # This will now be the calculated sum
 
+class BillBatch(BaseModel):
+    bills: List[BillText] = Field(..., description="Bill texts to parse, results are returned in the same order")
+
+class BatchParsedBill(ParsedBillResponse):
+    error: Optional[str] = None # Set (with no products) when this bill could not be parsed
+
+class BatchParsedBillResponse(BaseModel):
+    results: List[BatchParsedBill]
+
 # Removed ProductQuery model
 
 class GeneratedInsightsResponse(BaseModel):
@@ -70,20 +116,32 @@ class BillContentAnalysisResponse(BaseModel):
 
 # --- Financial Analysis Logic ---
 # Ensure function definition starts at column 0
+def build_financial_analysis_prompt(data: FinancialDataInput) -> Tuple[str, Dict[str, Any]]:
+    """Returns the Gemini prompt for /analyze-finances and the normalized inputs used as its cache key."""
+    fixed_expenses = sum(data.expenses.values())
+    disc_perc = data.discretionary_percentage if data.discretionary_percentage is not None else 0.2
+    disc_exp = fixed_expenses * disc_perc
+    prompt = f"""Analyze ... Income: ${data.income:,.2f} ... Fixed Exp: ${fixed_expenses:,.2f} ... Disc Exp: ${disc_exp:,.2f} ... Goals: {data.savings_goals} ... Provide concise analysis: 1. Timeline 2. Budget Tips 3. Investment Intro 4. Mindful Spending.""" # Truncated prompt
+    cache_inputs = {
+        "income": round(data.income, 2),
+        "expenses": {k: round(v, 2) for k, v in data.expenses.items()},
+        "savings_goals": {k: round(v, 2) for k, v in data.savings_goals.items()},
+        "discretionary_percentage": disc_perc,
+    }
+    return prompt, cache_inputs
+
 async def get_financial_analysis(data: FinancialDataInput) -> str:
     # Ensure code inside function is indented by 4 spaces
     if not api_key:
         raise HTTPException(status_code=503, detail="Google API Key not configured on server.")
     try:
-        fixed_expenses = sum(data.expenses.values())
-        disc_perc = data.discretionary_percentage if data.discretionary_percentage is not None else 0.2
-        disc_exp = fixed_expenses * disc_perc
-        prompt = f"""Analyze ... Income: ${data.income:,.2f} ... Fixed Exp: ${fixed_expenses:,.2f} ... Disc Exp: ${disc_exp:,.2f} ... Goals: {data.savings_goals} ... Provide concise analysis: 1. Timeline 2. Budget Tips 3. Investment Intro 4. Mindful Spending.""" # Truncated prompt
+        prompt, cache_inputs = build_financial_analysis_prompt(data)
         print("--- Sending prompt to Gemini for /analyze-finances ---")
-        model = genai.GenerativeModel("gemini-1.5-flash")
-        response = await asyncio.wait_for(model.generate_content_async(prompt), timeout=30.0)
+        analysis_text = await generate_text_cached("analyze-finances", cache_inputs, prompt)
         print("--- Received response from Gemini for /analyze-finances ---")
-        return response.text
+        return analysis_text
+    except GatewayOverloaded:
+        raise
     except asyncio.TimeoutError:
         print("Error: Timeout GenAI (/analyze-finances).")
         raise HTTPException(status_code=504, detail="Timeout generating analysis.")
@@ -114,92 +172,107 @@ PRODUCT_CATEGORIES = { # --- ENSURE COMPLETE LIST ---
     "Others": []
 }
 
+# Compiled once at startup; refresh() recompiles only if PRODUCT_CATEGORIES is edited
+product_classifier = KeywordClassifier(PRODUCT_CATEGORIES)
+
 # --- REVERTED Extraction Functions ---
-def extract_and_classify_products(text: str) -> List[ProductItem]:
+def iter_classified_products(lines: Iterable[str]) -> Iterator[ProductItem]:
     """
-    Extracts products and prices by assuming the RIGHTMOST number on a line is the price.
-    Classifies products based on keywords. (REVERTED LOGIC)
+    Yields a ProductItem for each line that has a product name followed by a price,
+    assuming the RIGHTMOST number on a line is the price. Lines are consumed lazily,
+    so callers can feed an unbounded stream of lines.
     """
-    lines = text.strip().split('\n')
-    product_list = []
-    print("--- Starting Product Extraction (Rightmost Number Logic) ---")
+    product_classifier.refresh()
     # Ensure loop body is indented correctly (4 spaces)
-    for idx, line in enumerate(lines):
+    for line in lines:
         line = line.strip()
         if not line:
             continue
-        # print(f"Processing line {idx+1}: '{line}'") # Verbose log
-        words = line.split()
-        price_found: Optional[float] = None
-        price_index: int = -1
+        # print(f"Processing line: '{line}'") # Verbose log
         product_name: str = ""
 
-        # Find the index of the rightmost word that looks like a number
-        # Ensure loop body is indented correctly (8 spaces)
-        for i in range(len(words) - 1, -1, -1):
-            word = words[i]
-            # Basic check: remove common non-numeric chars and see if it's potentially a float
-            cleaned_word = word.replace('$', '').replace('€', '').replace('£', '').replace('₹', '').replace(',', '').replace('-', '')
-            if cleaned_word and cleaned_word != '.': # Must not be empty or just a dot
-                # Ensure try block is indented correctly (12 spaces)
-                try:
-                    # Try converting the cleaned word
-                    price_found = float(cleaned_word)
-                    price_index = i # Store index of the word we assume is price
-                    break # Found the rightmost potential number, stop searching this line
-                except ValueError:
-                    continue # Word wasn't a valid number, keep searching backwards
+        # Rightmost word that reads as a number (after stripping currency/separators) is the price
+        price_start, price_found = find_rightmost_price(line)
 
         # Process if a price was found and there's something before it
         # Ensure 'if' block is indented correctly (8 spaces)
-        if price_found is not None and price_index >= 0:
-            # Name is everything *before* the identified price word index
-            product_name = ' '.join(words[:price_index]).strip()
+        if price_found is not None and price_start >= 0:
+            # Name is everything *before* the identified price word
+            product_name = ' '.join(line[:price_start].split()).strip()
 
             # If name is empty (price was first word), or if name is just another number, skip
             if not product_name or product_name.isdigit():
                 print(f"  Skipping line: No valid product name found before price '{price_found}'. Line: '{line}'")
                 continue # Use continue instead of break inside the outer loop
 
-            # Classify product
-            product_category = "Others"
-            product_name_upper = product_name.upper()
-            classified = False
-            # Ensure loop body is indented correctly (12 spaces)
-            for category, keywords in PRODUCT_CATEGORIES.items():
-                # Ensure 'if' block is indented correctly (16 spaces)
-                if category == "Others":
-                    continue
-                # Ensure 'if' block is indented correctly (16 spaces)
-                if any(f" {keyword} " in f" {product_name_upper} " or \
-                       product_name_upper.endswith(f" {keyword}") or \
-                       product_name_upper.startswith(f"{keyword} ") or \
-                       product_name_upper == keyword for keyword in keywords):
-                    product_category = category
-                    classified = True
-                    break # Ensure break is indented under the if
+            # Classify product (first matching category in PRODUCT_CATEGORIES wins)
+            product_category = product_classifier.classify(product_name)
             # print(f"  Added Product: Name='{product_name}', Price={price_found}, Category='{product_category}'") # Verbose log
-            product_list.append(ProductItem(name=product_name, price=price_found, category=product_category))
+            yield ProductItem(name=product_name, price=price_found, category=product_category)
         # Ensure 'elif' aligns with 'if' above it (or use 'else')
         # elif line: print(f"  No reliable product/price found on line.") # Verbose log
 
+def extract_and_classify_products(text: str) -> List[ProductItem]:
+    """
+    Extracts products and prices by assuming the RIGHTMOST number on a line is the price.
+    Classifies products based on keywords. (REVERTED LOGIC)
+    """
+    print("--- Starting Product Extraction (Rightmost Number Logic) ---")
+    product_list = list(iter_classified_products(text.strip().split('\n')))
     print(f"--- Finished Product Extraction: Found {len(product_list)} items ---")
     return product_list
 
+def calculate_bill_total(products: List[ProductItem]) -> Optional[float]:
+    """Sum of extracted item prices rounded to 2 decimals, or None if no products were found."""
+    if not products:
+        return None
+    return round(sum(item.price for item in products if isinstance(item.price, (int, float))), 2)
+
+# --- Batch Parsing (process pool) ---
+# Worker processes for POST /parse-bill/batch; created on first use so plain
+# single-bill deployments never fork. Defaults to one worker per CPU.
+PARSE_POOL_WORKERS = int(os.getenv("PARSE_POOL_WORKERS", "0")) or (os.cpu_count() or 1)
+PARSE_BATCH_CHUNK_SIZE = int(os.getenv("PARSE_BATCH_CHUNK_SIZE", "32"))
+PARSE_BATCH_MAX_BILLS = int(os.getenv("PARSE_BATCH_MAX_BILLS", "10000"))
+# Longest line POST /parse-bill/stream will buffer; longer lines are skipped
+PARSE_STREAM_MAX_LINE_CHARS = int(os.getenv("PARSE_STREAM_MAX_LINE_CHARS", "65536"))
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(max_workers=PARSE_POOL_WORKERS)
+        print(f"Started bill parsing pool with {PARSE_POOL_WORKERS} worker(s).")
+    return _parse_pool
+
+def parse_bill_chunk(texts: List[str]) -> List[Dict[str, Any]]:
+    """
+    Runs in a pool worker: parses each bill text and returns plain dicts
+    (cheap to pickle back) with products, calculated total and any error.
+    """
+    results = []
+    for text in texts:
+        if not text or text.isspace():
+            results.append({"classified_products": [], "final_amount": None, "error": "Input text cannot be empty."})
+            continue
+        try:
+            products = extract_and_classify_products(text)
+            results.append({
+                "classified_products": [item.model_dump() for item in products],
+                "final_amount": calculate_bill_total(products),
+                "error": None,
+            })
+        except Exception as e:
+            print(f"Error parsing bill text in batch. Input: '{text[:100]}...', Error: {e}")
+            results.append({"classified_products": [], "final_amount": None, "error": "Internal error parsing bill."})
+    return results
+
 # --- Function extract_final_amount_from_total REMOVED ---
 
 # --- Helper Function for Bill Content Analysis ---
 # Ensure function definition starts at column 0
-async def get_bill_content_analysis(products: List[ProductItem], calculated_total: Optional[float]) -> str:
-    # Modified to ONLY accept calculated_total (sum of items)
-    """Generates insights specifically about the content of a parsed bill using Gemini."""
-    # Ensure code inside function is indented correctly
-    if not api_key:
-        raise HTTPException(status_code=503, detail="Google API Key not configured on server.")
-    # Check depends only on products now
-    if not products:
-        return "Could not extract any products from the bill to analyze."
-
+def build_bill_content_prompt(products: List[ProductItem], calculated_total: Optional[float]) -> Tuple[str, Dict[str, Any]]:
+    """Returns the Gemini prompt for /analyze_bill_content and the normalized inputs used as its cache key."""
     prompt_data = "Parsed Bill Content:\n"
     category_totals: Dict[str, float] = {}
     # Ensure 'if' block is indented correctly
@@ -235,14 +308,32 @@ async def get_bill_content_analysis(products: List[ProductItem], calculated_tota
     4.  **Actionable Tip (General):** Offer ONE general money-saving tip relevant to the *types* of items found on this bill (e.g., if lots of snacks, suggest checking unit prices; if mostly groceries, suggest meal planning).
     Keep analysis focused ONLY on the data provided from this single bill. Do not assume monthly income or compare to external budgets. Be brief.
     """
+    cache_inputs = {
+        "items": sorted((item.name.strip().upper(), item.category, round(item.price, 2)) for item in products),
+        "calculated_total": calculated_total,
+    }
+    return prompt, cache_inputs
+
+async def get_bill_content_analysis(products: List[ProductItem], calculated_total: Optional[float]) -> str:
+    # Modified to ONLY accept calculated_total (sum of items)
+    """Generates insights specifically about the content of a parsed bill using Gemini."""
+    # Ensure code inside function is indented correctly
+    if not api_key:
+        raise HTTPException(status_code=503, detail="Google API Key not configured on server.")
+    # Check depends only on products now
+    if not products:
+        return "Could not extract any products from the bill to analyze."
+
+    prompt, cache_inputs = build_bill_content_prompt(products, calculated_total)
     # Ensure try block is indented correctly
     try:
         print("--- Sending prompt to Gemini for /analyze_bill_content ---")
-        model = genai.GenerativeModel("gemini-1.5-flash")
-        response = await asyncio.wait_for(model.generate_content_async(prompt), timeout=30.0)
+        analysis_text = await generate_text_cached("analyze_bill_content", cache_inputs, prompt)
         print("--- Received response from Gemini for /analyze_bill_content ---")
-        return response.text
+        return analysis_text
     # Ensure except blocks align with try
+    except GatewayOverloaded:
+        raise
     except asyncio.TimeoutError:
         print("Error: Timeout GenAI (/analyze_bill_content).")
         return "Error: Timed out while generating insights for this bill."
@@ -277,11 +368,7 @@ async def parse_bill_endpoint(bill_data: BillText):
         classified_products = extract_and_classify_products(bill_data.text)
 
         # --- Step 2: Calculate final_amount by summing prices ---
-        calculated_total: Optional[float] = None
-        if classified_products: # Only calculate if products were found
-            total_sum = sum(item.price for item in classified_products if isinstance(item.price, (int, float))) # Add type check
-            calculated_total = round(total_sum, 2) # Round to 2 decimal places
-        # --- End Calculation ---
+        calculated_total = calculate_bill_total(classified_products)
 
         # --- Print Results ---
         print("\n--- /parse-bill Results (Sum Calculation) ---")
@@ -309,6 +396,118 @@ async def parse_bill_endpoint(bill_data: BillText):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail="Internal error parsing bill.")
 
+@app.post("/parse-bill/batch", response_model=BatchParsedBillResponse, tags=["Parsing"])
+async def parse_bill_batch_endpoint(batch: BillBatch):
+    """
+    Parses many bills in one request, fanned out in chunks over the worker
+    process pool so the event loop (and /parse-bill) stays free meanwhile.
+    Each result carries its own final_amount; a bill that fails to parse gets
+    an `error` instead of failing the whole batch.
+    """
+    print(f"Received request for /parse-bill/batch with {len(batch.bills)} bills")
+    if not batch.bills:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one bill.")
+    if len(batch.bills) > PARSE_BATCH_MAX_BILLS:
+        raise HTTPException(status_code=413, detail=f"Batch too large (max {PARSE_BATCH_MAX_BILLS} bills).")
+
+    texts = [bill.text for bill in batch.bills]
+    chunks = [texts[i:i + PARSE_BATCH_CHUNK_SIZE] for i in range(0, len(texts), PARSE_BATCH_CHUNK_SIZE)]
+    loop = asyncio.get_running_loop()
+    pool = get_parse_pool()
+    try:
+        chunk_results = await asyncio.gather(*(loop.run_in_executor(pool, parse_bill_chunk, chunk) for chunk in chunks))
+    except Exception as e:
+        print(f"Error running bill parsing batch: {e}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail="Internal error parsing bill batch.")
+
+    results = [BatchParsedBill(**result) for chunk in chunk_results for result in chunk]
+    failed = sum(1 for result in results if result.error)
+    print(f"Finished /parse-bill/batch: {len(results)} bills, {failed} failed")
+    return BatchParsedBillResponse(results=results)
+
+class BodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for endpoints that keep reading the request body while
+    they respond. The stock class watches for client disconnects by calling
+    receive(), which would swallow the body chunks; here a disconnect instead
+    surfaces from request.stream() as ClientDisconnect.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
+
+async def iter_body_line_batches(chunks: AsyncIterator[bytes], max_line_chars: int) -> AsyncIterator[List[str]]:
+    """
+    Turns a raw UTF-8 request body into batches of complete lines, one batch per
+    received chunk, holding back only the unfinished last line. A line longer than
+    `max_line_chars` is dropped rather than buffered, so memory stays bounded.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    skipping = False # Inside an over-long line; drop text up to the next newline
+    async for chunk in chunks:
+        lines = (pending + decoder.decode(chunk)).split('\n')
+        pending = lines.pop()
+        if skipping and lines:
+            lines = lines[1:]
+            skipping = False
+        if len(pending) > max_line_chars:
+            print(f"Warning: Skipping line longer than {max_line_chars} characters in streamed bill.")
+            pending = ""
+            skipping = True
+        if lines:
+            yield lines
+    pending += decoder.decode(b"", final=True)
+    if pending and not skipping:
+        yield [pending]
+
+@app.post("/parse-bill/stream", tags=["Parsing"])
+async def parse_bill_stream_endpoint(request: Request):
+    """
+    Parses a bill sent as the raw request body (text/plain, UTF-8) while it is
+    being uploaded, streaming back NDJSON: one {"name", "price", "category"}
+    object per product as it is found, then {"final_amount", "count"} with the
+    calculated total. Neither the body nor the product list is held in memory.
+    """
+    print("Received request for /parse-bill/stream")
+
+    async def parse():
+        count = 0
+        total = 0.0
+        try:
+            async for lines in iter_body_line_batches(request.stream(), PARSE_STREAM_MAX_LINE_CHARS):
+                out = []
+                for item in iter_classified_products(lines):
+                    count += 1
+                    total += item.price
+                    out.append(json.dumps(item.model_dump()) + "\n")
+                if out:
+                    yield "".join(out)
+        except ClientDisconnect:
+            print(f"Client disconnected from /parse-bill/stream after {count} items")
+            return
+        except Exception as e:
+            print(f"Error parsing streamed bill after {count} items: {e}")
+            traceback.print_exc()
+            yield json.dumps({"error": "Internal error parsing bill."}) + "\n"
+            return
+        final_amount = round(total, 2) if count else None
+        print(f"Finished /parse-bill/stream: {count} items, final amount {final_amount}")
+        yield json.dumps({"final_amount": final_amount, "count": count}) + "\n"
+
+    return BodyStreamingResponse(parse(), media_type="application/x-ndjson")
+
+@app.on_event("shutdown")
+def shutdown_parse_pool():
+    if _parse_pool is not None:
+        _parse_pool.shutdown(cancel_futures=True)
+
 # --- Product Recommender Endpoint REMOVED ---
 
 @app.post("/generate_insights/", response_model=GeneratedInsightsResponse, tags=["Insights"])
@@ -322,8 +521,8 @@ async def generate_insights_endpoint():
     prompt = f"""Analyze ... strictly in JSON format ... Expense Data:\n{expense_data_for_insights}\n...""" # Truncated
     try:
         print("--- Sending prompt to Gemini for /generate_insights/ ---")
-        model = genai.GenerativeModel("gemini-1.5-flash")
-        response = model.generate_content(prompt)
+        # Async call so the LLM round trip does not block the event loop; wait_for cancels it on timeout
+        response = await llm_gateway.generate(prompt, timeout=30.0)
         print("--- Received response from Gemini for /generate_insights/ ---")
         try:
             cleaned_text = response.text.strip().strip('```json').strip('```').strip()
@@ -333,6 +532,11 @@ async def generate_insights_endpoint():
         except Exception as parse_e:
             print(f"Error processing Gemini response for insights: {parse_e}. Raw: {response.text}")
             return GeneratedInsightsResponse(insights=f"Error processing AI response. Raw text: {response.text}")
+    except GatewayOverloaded:
+        raise
+    except asyncio.TimeoutError:
+        print("Error: Timeout GenAI (/generate_insights/).")
+        raise HTTPException(status_code=504, detail="Timeout generating insights.")
     except Exception as e:
         print(f"Error during GenAI call (/generate_insights/): {e}")
         raise HTTPException(status_code=500, detail=f"Failed to generate insights: {e}")
@@ -349,10 +553,7 @@ async def analyze_bill_content_endpoint(bill_data: BillText):
         # Calls the REVERTED extraction function
         classified_products = extract_and_classify_products(bill_data.text)
         # Calculate the total based on extracted products for analysis
-        final_amount_calculated: Optional[float] = None
-        if classified_products:
-            total_sum = sum(item.price for item in classified_products if isinstance(item.price, (int, float)))
-            final_amount_calculated = round(total_sum, 2)
+        final_amount_calculated = calculate_bill_total(classified_products)
         # REMOVED call to extract_final_amount_from_total
         print(f"Intermediate parsing for analysis: Found {len(classified_products)} items, Calculated Total: {final_amount_calculated}")
     except Exception as e:
@@ -365,13 +566,123 @@ async def analyze_bill_content_endpoint(bill_data: BillText):
         analysis_text = await get_bill_content_analysis(classified_products, final_amount_calculated)
         print("Successfully generated bill content analysis.")
         return BillContentAnalysisResponse(analysis=analysis_text)
-    except HTTPException as e:
+    except (HTTPException, GatewayOverloaded) as e:
         raise e # Re-raise specific HTTP errors
     except Exception as e:
         print(f"Unexpected error calling get_bill_content_analysis: {e}")
         traceback.print_exc()
         raise HTTPException(status_code=500, detail="Failed to generate analysis for the parsed bill content.")
 
+# --- Streaming (Server-Sent Events) variants ---
+def _sse(event: str, payload: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+def _chunk_text(chunk: Any) -> str:
+    try:
+        return chunk.text
+    except (ValueError, AttributeError): # e.g. a chunk holding only safety metadata
+        return ""
+
+async def stream_gemini_analysis(label: str, namespace: str, prompt: str, cache_inputs: Dict[str, Any]) -> StreamingResponse:
+    """
+    Streams Gemini output as SSE: `chunk` events with {"text": ...}, then `done`
+    (or `error`). Errors before the first chunk (overload, timeout) are normal
+    HTTP errors. If the client disconnects, the upstream stream is closed.
+    A cached answer is replayed as a single chunk; a completed stream is cached.
+    """
+    key = cache_key(namespace, cache_inputs)
+    cached = response_cache.lookup(key)
+    if cached is not None:
+        async def replay():
+            yield _sse("chunk", {"text": cached})
+            yield _sse("done", {"cached": True})
+        return StreamingResponse(replay(), media_type="text/event-stream")
+
+    print(f"--- Streaming prompt to Gemini for {label} ---")
+    upstream = llm_gateway.stream(prompt, timeout=30.0)
+    try:
+        first_chunk = await upstream.__anext__()
+    except StopAsyncIteration:
+        first_chunk = None
+    except GatewayOverloaded:
+        raise
+    except asyncio.TimeoutError:
+        print(f"Error: Timeout GenAI ({label}).")
+        raise HTTPException(status_code=504, detail="Timeout generating analysis.")
+    except Exception as e:
+        print(f"Error GenAI call ({label}): {e}")
+        raise HTTPException(status_code=500, detail=f"Failed analysis: {e}")
+
+    async def relay():
+        parts: List[str] = []
+        try:
+            chunk = first_chunk
+            while chunk is not None:
+                text = _chunk_text(chunk)
+                if text:
+                    parts.append(text)
+                    yield _sse("chunk", {"text": text})
+                chunk = await anext(upstream, None)
+        except asyncio.TimeoutError:
+            print(f"Error: Timeout GenAI ({label}) mid-stream.")
+            yield _sse("error", {"detail": "Timeout generating analysis."})
+            return
+        except Exception as e:
+            print(f"Error GenAI call ({label}) mid-stream: {e}")
+            yield _sse("error", {"detail": f"Failed analysis: {e}"})
+            return
+        finally:
+            await upstream.aclose() # No-op when finished; cancels the upstream call on disconnect
+        response_cache.store(key, "".join(parts))
+        print(f"--- Finished streaming from Gemini for {label} ---")
+        yield _sse("done", {"cached": False})
+
+    # The background task also closes the upstream if the client left before relay() started
+    return StreamingResponse(relay(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+                             background=BackgroundTask(upstream.aclose))
+
+@app.post("/analyze-finances/stream", tags=["Analysis"])
+async def analyze_finances_stream_endpoint(data: FinancialDataInput):
+    """Same analysis as /analyze-finances, streamed as Server-Sent Events while it is generated."""
+    print(f"Received request for /analyze-finances/stream with income: {data.income}")
+    if not api_key:
+        raise HTTPException(status_code=503, detail="Google API Key not configured on server.")
+    prompt, cache_inputs = build_financial_analysis_prompt(data)
+    return await stream_gemini_analysis("/analyze-finances/stream", "analyze-finances", prompt, cache_inputs)
+
+@app.post("/analyze_bill_content/stream", tags=["Analysis"])
+async def analyze_bill_content_stream_endpoint(bill_data: BillText):
+    """Same analysis as /analyze_bill_content, streamed as Server-Sent Events while it is generated."""
+    print(f"Received request for /analyze_bill_content/stream with text length: {len(bill_data.text)}")
+    if not bill_data.text or bill_data.text.isspace():
+         raise HTTPException(status_code=400, detail="Input text cannot be empty.")
+    if not api_key:
+        raise HTTPException(status_code=503, detail="Google API Key not configured on server.")
+    try:
+        classified_products = extract_and_classify_products(bill_data.text)
+    except Exception as e:
+        print(f"Error during initial parsing step for bill analysis: {e}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail="Failed to parse bill text before analysis.")
+    if not classified_products:
+        async def nothing_to_analyze():
+            yield _sse("chunk", {"text": "Could not extract any products from the bill to analyze."})
+            yield _sse("done", {"cached": False})
+        return StreamingResponse(nothing_to_analyze(), media_type="text/event-stream")
+    prompt, cache_inputs = build_bill_content_prompt(classified_products, calculate_bill_total(classified_products))
+    return await stream_gemini_analysis("/analyze_bill_content/stream", "analyze_bill_content", prompt, cache_inputs)
+
+@app.get("/llm/stats", tags=["Monitoring"])
+async def llm_stats_endpoint():
+    """Concurrency, queue-time and load-shedding figures for Gemini calls."""
+    return llm_gateway.stats()
+
+@app.get("/cache/stats", tags=["Monitoring"])
+async def cache_stats_endpoint():
+    """Hit/miss counters for the Gemini response cache."""
+    return response_cache.stats()
+
 @app.get("/", include_in_schema=False)
 async def root():
     """Root endpoint for basic API check."""
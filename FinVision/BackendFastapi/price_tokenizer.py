@@ -0,0 +1,63 @@
+# price_tokenizer.py
+import re
+from typing import Optional, Tuple
+
+# Characters ignored wherever they appear in a price word: currency symbols,
+# thousands separators and minus signs.
+PRICE_STRIP_CHARS = "$€£₹,-"
+_STRIP_TABLE = str.maketrans("", "", PRICE_STRIP_CHARS)
+_PLAIN_PRICE_CHARS = "0123456789."
+
+
+def _build_price_word_pattern() -> str:
+    """
+    A whitespace-delimited word that float() accepts once PRICE_STRIP_CHARS are
+    removed: optional '+', Unicode decimal digits with single underscores
+    between them, optional fraction and exponent, or inf/infinity/nan in any
+    case. Every atom may be followed by any run of strip characters, so the
+    word is recognised without cleaning it first.
+    """
+    s = f"[{re.escape(PRICE_STRIP_CHARS)}]*"
+
+    def letters(word: str) -> str:
+        return "".join(f"[{c.lower()}{c.upper()}]{s}" for c in word)
+
+    digits = rf"\d{s}(?:(?:_{s})?\d{s})*"
+    number = rf"(?:{digits}(?:\.{s}(?:{digits})?)?|\.{s}{digits})(?:[eE]{s}(?:\+{s})?{digits})?"
+    special = rf"{letters('inf')}(?:{letters('inity')})?|{letters('nan')}"
+    return rf"(?<!\S){s}(?:\+{s})?(?:{number}|{special})(?!\S)"
+
+
+_PRICE_WORD = re.compile(_build_price_word_pattern())
+# Greedy prefix: the engine starts at the end of the line and backtracks
+# leftwards, so the first price word it can match is the rightmost one.
+_RIGHTMOST_PRICE_WORD = re.compile(rf"(?s:.*)({_PRICE_WORD.pattern})")
+
+
+def _to_float(token: str) -> float:
+    # Most prices are bare "12.40"; skip the translate pass for those
+    if token.strip(_PLAIN_PRICE_CHARS):
+        token = token.translate(_STRIP_TABLE)
+    return float(token)
+
+
+def parse_price_token(word: str) -> Optional[float]:
+    """Returns the number a single word represents after stripping, or None."""
+    if _PRICE_WORD.fullmatch(word) is None:
+        return None
+    return _to_float(word)
+
+
+def find_rightmost_price(line: str) -> Tuple[int, Optional[float]]:
+    """
+    Finds the rightmost whitespace-separated word of `line` that reads as a
+    number with a single regex match, scanning from the end of the line.
+
+    Returns:
+        (offset, price) where offset is the index in `line` at which that word
+        starts, or (-1, None) if no word is numeric.
+    """
+    match = _RIGHTMOST_PRICE_WORD.match(line)
+    if match is None:
+        return -1, None
+    return match.start(1), _to_float(match.group(1))
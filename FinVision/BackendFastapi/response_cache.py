@@ -0,0 +1,163 @@
+# response_cache.py
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+
+def cache_key(namespace: str, inputs: Any) -> str:
+    """Stable hash of JSON-serialisable inputs (dict key order does not matter)."""
+    payload = json.dumps(inputs, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{namespace}\n{payload}".encode("utf-8")).hexdigest()
+
+
+class MemoryCacheBackend:
+    """In-process LRU store with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self._entries[key] = (time.time() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCacheBackend:
+    """
+    One JSON file per key in `directory`; survives restarts and can be shared by
+    workers on the same host. Recency is tracked with file mtimes for LRU eviction.
+    """
+
+    def __init__(self, directory: str, max_entries: int = 10000):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("expires_at", 0) <= time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("value")
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"expires_at": time.time() + ttl, "value": value}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = [e for e in os.scandir(self.directory) if e.name.endswith(".json")]
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries[:len(entries) - self.max_entries]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def __len__(self) -> int:
+        return sum(1 for e in os.scandir(self.directory) if e.name.endswith(".json"))
+
+
+class ResponseCache:
+    """
+    TTL cache for LLM responses in front of a pluggable backend. Concurrent
+    misses for the same key are coalesced into one upstream call; failures
+    are passed to every waiter and never cached.
+    """
+
+    def __init__(self, backend, ttl: float = 3600.0):
+        self.backend = backend
+        self.ttl = ttl
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._counters = {"hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Cached value for key, or None; counted as a hit or miss."""
+        value = self.backend.get(key)
+        self._counters["hits" if value is not None else "misses"] += 1
+        return value
+
+    def store(self, key: str, value: str) -> None:
+        self.backend.set(key, value, self.ttl)
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[str]]) -> str:
+        value = self.backend.get(key)
+        if value is not None:
+            self._counters["hits"] += 1
+            return value
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self._counters["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        self._counters["misses"] += 1
+        pending = asyncio.get_running_loop().create_future()
+        # Followers may all have gone away; don't warn about an unretrieved exception
+        pending.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight[key] = pending
+        try:
+            value = await compute()
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except Exception as e:
+            self._counters["errors"] += 1
+            pending.set_exception(e)
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+        self.backend.set(key, value, self.ttl)
+        pending.set_result(value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self._counters["hits"] + self._counters["misses"] + self._counters["coalesced"]
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "ttl_seconds": self.ttl,
+            **self._counters,
+            "hit_ratio": (self._counters["hits"] + self._counters["coalesced"]) / lookups if lookups else 0.0,
+        }
@@ -1,20 +1,41 @@
+import os
+from typing import List
 from fastapi import FastAPI
 from pydantic import BaseModel
 from simplified_recommender import SimplifiedProductRecommender
 
+# "warm" (default): load saved models from product_recommender_models/ and only
+# retrain if they are missing or stale; "train": always retrain on startup.
+STARTUP_MODE = os.getenv("RECOMMENDER_STARTUP_MODE", "warm")
+MODEL_DIR = os.getenv("RECOMMENDER_MODEL_DIR", "product_recommender_models")
+
 app = FastAPI()
 recommender = SimplifiedProductRecommender("category.csv")
-recommender.train_models()
+if STARTUP_MODE == "train":
+    recommender.train_models()
+    recommender.save_models(MODEL_DIR)
+else:
+    recommender.load_or_train(MODEL_DIR)
 
 class ProductRequest(BaseModel):
     product_id: str
     method: str = "basic"
 
+class BatchProductRequest(BaseModel):
+    product_ids: List[str]
+    method: str = "basic"
+
 @app.get("/")
 def home():
-    return {"status": "Recommender service is up"}
+    return {"status": "Recommender service is up", "model_version": recommender.model_version}
 
 @app.post("/recommend")
 def recommend_product(request: ProductRequest):
     result = recommender.scan_product(request.product_id, method=request.method)
     return result
+
+@app.post("/recommend/batch")
+def recommend_products(request: BatchProductRequest):
+    """Recommendations for every product on a receipt in one call, keyed by product_id."""
+    results = recommender.recommend_alternatives_batch(request.product_ids, method=request.method)
+    return {"method": request.method, "results": results}
@@ -1,299 +1,578 @@
-import pandas as pd
-import numpy as np
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.ensemble import RandomForestRegressor
-import joblib
-
-class SimplifiedProductRecommender:
-    def __init__(self, csv_path):
-        """Initialize the recommender with product data from a CSV file."""
-        # Load data from CSV file
-        self.df = pd.read_csv(csv_path)
-        
-        # Ensure price and rating are numeric
-        self.df['price'] = pd.to_numeric(self.df['price'])
-        self.df['rating'] = pd.to_numeric(self.df['rating'])
-        
-        # Create a value score that balances price and rating
-        self.df['value_score'] = self.df['rating'] / self.df['price']
-        
-        # Initialize models
-        self.similarity_matrix = None
-        self.prediction_model = None
-        self.is_trained = False
-        
-    def train_models(self):
-        """Train the similarity model and prediction model for recommendations."""
-        # 1. Similarity-based model
-        self._train_similarity_model()
-        
-        # 2. Price-quality prediction model for customer satisfaction
-        self._train_prediction_model()
-        
-        self.is_trained = True
-        print("Models trained successfully.")
-        
-    def _train_similarity_model(self):
-        """Train a content-based similarity model."""
-        # Create feature matrix for similarity calculation
-        # Using category as a one-hot encoded feature
-        categories = pd.get_dummies(self.df['category'])
-        
-        # Create a price range feature (normalized)
-        scaler = StandardScaler()
-        price_scaled = scaler.fit_transform(self.df[['price']])
-        
-        # Combine features
-        features = np.hstack((categories.values, price_scaled, self.df[['rating']].values))
-        
-        # Calculate similarity matrix
-        self.similarity_matrix = cosine_similarity(features)
-        
-        # Store category encodings for future use
-        self.category_features = categories.columns.tolist()
-        self.price_scaler = scaler
-        
-    def _train_prediction_model(self):
-        """Train a model to predict if a customer will like a product based on its attributes."""
-        # Features: price, category (one-hot encoded)
-        categories = pd.get_dummies(self.df['category'])
-        X = pd.concat([self.df[['price']], categories], axis=1)
-        
-        # Target: rating (we're assuming ratings represent user satisfaction)
-        y = self.df['rating']
-        
-        # Train model
-        self.prediction_model = RandomForestRegressor(n_estimators=100, random_state=42)
-        self.prediction_model.fit(X, y)
-        
-    def save_models(self, path="product_recommender_models"):
-        """Save trained models to disk."""
-        import os
-        if not os.path.exists(path):
-            os.makedirs(path)
-            
-        # Save similarity matrix
-        np.save(f"{path}/similarity_matrix.npy", self.similarity_matrix)
-        
-        # Save prediction model
-        joblib.dump(self.prediction_model, f"{path}/prediction_model.pkl")
-        
-        # Save scaler
-        joblib.dump(self.price_scaler, f"{path}/price_scaler.pkl")
-        
-        # Save category features
-        pd.Series(self.category_features).to_csv(f"{path}/category_features.csv", index=False)
-        
-        print(f"Models saved to {path}")
-        
-    def load_models(self, path="product_recommender_models"):
-        """Load trained models from disk."""
-        import os
-        if not os.path.exists(path):
-            print("Model path does not exist. Models need to be trained first.")
-            return False
-            
-        # Load similarity matrix
-        self.similarity_matrix = np.load(f"{path}/similarity_matrix.npy")
-        
-        # Load prediction model
-        self.prediction_model = joblib.load(f"{path}/prediction_model.pkl")
-        
-        # Load scaler
-        self.price_scaler = joblib.load(f"{path}/price_scaler.pkl")
-        
-        # Load category features
-        self.category_features = pd.read_csv(f"{path}/category_features.csv").iloc[:, 0].tolist()
-        
-        self.is_trained = True
-        print("Models loaded successfully.")
-        return True
-    
-    def get_similar_products(self, product_id, top_n=5):
-        """Find the most similar products to the given product."""
-        if not self.is_trained:
-            print("Models are not trained. Call train_models() first.")
-            return None
-            
-        # Find the product index
-        try:
-            idx = self.df[self.df['product_id'] == product_id].index[0]
-        except IndexError:
-            return f"Product {product_id} not found in database."
-            
-        # Get similarity scores
-        similarity_scores = self.similarity_matrix[idx]
-        
-        # Get indices of most similar products (excluding the product itself)
-        similar_indices = similarity_scores.argsort()[::-1][1:top_n+1]
-        
-        # Return similar products
-        return self.df.iloc[similar_indices]
-    
-    def predict_user_satisfaction(self, product_id):
-        """Predict how likely a user is to be satisfied with a product."""
-        if not self.is_trained or self.prediction_model is None:
-            print("Prediction model is not trained. Call train_models() first.")
-            return None
-            
-        # Find the product
-        try:
-            product = self.df[self.df['product_id'] == product_id].iloc[0]
-        except IndexError:
-            return f"Product {product_id} not found in database."
-            
-        # Prepare features
-        category_one_hot = pd.DataFrame(columns=self.category_features)
-        category_one_hot.loc[0] = 0
-        category_one_hot[product['category']] = 1
-        
-        X = pd.concat([pd.DataFrame({'price': [product['price']]}), category_one_hot], axis=1)
-        
-        # Predict satisfaction (rating)
-        predicted_rating = self.prediction_model.predict(X)[0]
-        
-        return predicted_rating
-    
-    def recommend_alternatives(self, product_id, top_n=3, method='basic'):
-        """
-        Recommend cheaper alternatives with good ratings for a given product.
-        
-        Args:
-            product_id: The ID of the scanned product
-            top_n: Number of recommendations to return
-            method: Recommendation method ('basic' or 'similar')
-            
-        Returns:
-            DataFrame with recommended alternatives
-        """
-        # Find the product
-        try:
-            target_product = self.df[self.df['product_id'] == product_id].iloc[0]
-        except IndexError:
-            return f"Product {product_id} not found in database."
-        
-        if method == 'basic':
-            # Use the basic method based on category
-            category = target_product['category']
-            category_products = self.df[self.df['category'] == category].copy()
-            
-            # Filter for cheaper products
-            cheaper_products = category_products[
-                (category_products['price'] < target_product['price']) &
-                (category_products['product_id'] != product_id)
-            ]
-            
-            if cheaper_products.empty:
-                return f"No cheaper alternatives found for {target_product['product_name']}."
-            
-            # Sort by value score
-            cheaper_products = cheaper_products.sort_values('value_score', ascending=False)
-            recommendations = cheaper_products.head(top_n).copy()
-            
-        elif method == 'similar' and self.is_trained:
-            # Use similarity-based recommendations
-            similar_products = self.get_similar_products(product_id, top_n=10)
-            
-            if isinstance(similar_products, str):
-                return similar_products
-                
-            # Filter for cheaper products
-            cheaper_similar = similar_products[
-                similar_products['price'] < target_product['price']
-            ]
-            
-            if cheaper_similar.empty:
-                return f"No cheaper similar alternatives found for {target_product['product_name']}."
-                
-            recommendations = cheaper_similar.head(top_n).copy()
-            
-        else:
-            return "Invalid method or models not trained. Choose 'basic' or 'similar'."
-        
-        # Calculate savings and value improvement
-        recommendations['price_savings'] = target_product['price'] - recommendations['price']
-        recommendations['price_savings_pct'] = (recommendations['price_savings'] / target_product['price'] * 100).round(1)
-        recommendations['rating_diff'] = (recommendations['rating'] - target_product['rating']).round(1)
-        
-        # Add predicted user satisfaction if available
-        if self.is_trained and self.prediction_model is not None:
-            recommendations['predicted_rating'] = recommendations['product_id'].apply(self.predict_user_satisfaction)
-        
-        # Format the output for better readability
-        result_cols = ['product_id', 'product_name', 'price', 'rating', 
-                      'price_savings', 'price_savings_pct', 'rating_diff']
-        
-        if 'predicted_rating' in recommendations.columns:
-            result_cols.append('predicted_rating')
-            
-        recommendations = recommendations[result_cols]
-        
-        return {
-            'original_product': {
-                'product_id': target_product['product_id'],
-                'product_name': target_product['product_name'],
-                'category': target_product['category'],
-                'price': target_product['price'],
-                'rating': target_product['rating']
-            },
-            'recommendations': recommendations.to_dict('records')
-        }
-    
-    def scan_product(self, product_id, method='basic'):
-        """Simulate scanning a product and getting recommendations."""
-        recommendations = self.recommend_alternatives(product_id, method=method)
-        
-        if isinstance(recommendations, str):
-            return recommendations
-        
-        original = recommendations['original_product']
-        recs = recommendations['recommendations']
-        
-        print(f"Scanned Product: {original['product_name']} (₹{float(original['price']):.2f}, Rating: {original['rating']})")
-        print(f"Category: {original['category']}")
-        print(f"Recommendation Method: {method}")
-        print("\nRecommended Alternatives:")
-        
-        for i, rec in enumerate(recs, 1):
-            price_diff = float(rec['price_savings'])
-            price_diff_pct = float(rec['price_savings_pct'])
-            rating_diff = float(rec['rating_diff'])
-            
-            rating_indicator = "↑" if rating_diff > 0 else "↓"
-            if rating_diff == 0:
-                rating_indicator = "="
-                
-            print(f"{i}. {rec['product_name']} - ₹{float(rec['price']):.2f} (Save ₹{price_diff:.2f}, {price_diff_pct}%)")
-            print(f"   Rating: {rec['rating']} {rating_indicator}")
-            
-            if 'predicted_rating' in rec:
-                pred_rating = float(rec['predicted_rating'])
-                print(f"   Predicted Satisfaction: {pred_rating:.1f}/5.0")
-                
-            print()
-            
-        return recommendations
-
-# Example usage
-if __name__ == "__main__":
-    csv_path = "category.csv"  # Replace with the path to your actual CSV file
-    
-    # Create the simplified recommender
-    recommender = SimplifiedProductRecommender(csv_path)
-    
-    # Train the models
-    recommender.train_models()
-    
-    # Save models for future use
-    recommender.save_models()
-    
-    # Or load pre-trained models
-    recommender.load_models()
-    
-    # Example recommendations with different methods
-    print("BASIC RECOMMENDATIONS:")
-    recommender.scan_product('HO_7443', method='basic')
-    
-    print("\nSIMILARITY-BASED RECOMMENDATIONS:")
+import pandas as pd
+import numpy as np
+from sklearn.preprocessing import StandardScaler, normalize
+from sklearn.ensemble import RandomForestRegressor
+import joblib
+import hashlib
+import json
+import os
+import time
+
+# Bump whenever the set or layout of files written by save_models() changes
+ARTIFACT_FORMAT_VERSION = 2
+MANIFEST_FILE = "manifest.json"
+ARTIFACT_FILES = ["similarity_features.npy", "neighbour_indices.npy", "neighbour_scores.npy",
+                  "prediction_model.pkl", "price_scaler.pkl", "category_features.csv"]
+
+# Neighbours kept per product; 'similar' recommendations look at the top 10
+DEFAULT_NEIGHBOUR_K = 20
+# Above this many products the neighbour lists are not precomputed and
+# get_similar_products() searches on demand instead
+NEIGHBOUR_INDEX_MAX_ROWS = 100_000
+# Upper bound on the size of one block of similarity scores (in elements)
+SIMILARITY_BLOCK_ELEMENTS = 8_000_000
+# 'basic' price tables: a running top-k by value score is kept every PRICE_CHECKPOINT_EVERY rows
+PRICE_CHECKPOINT_EVERY = 64
+PRICE_CHECKPOINT_TOP_K = 16
+
+def _best_value_first(positions, value_scores):
+    """Order row positions by descending value score, ties by row position."""
+    return positions[np.lexsort((positions, -value_scores[positions]))]
+
+class CategoryPriceTable:
+    """
+    One category's products sorted by price, with the best value scores of
+    every price prefix checkpointed so that "top-n cheaper items by value
+    score" is a binary search plus a merge of a few short arrays.
+    """
+
+    def __init__(self, positions, prices, value_scores):
+        by_price = np.lexsort((positions, prices[positions]))
+        self.positions = positions[by_price]
+        self.prices = prices[self.positions]
+
+        # checkpoints[c] holds the top-k of the c * PRICE_CHECKPOINT_EVERY cheapest rows (-1 padded)
+        n_checkpoints = len(self.positions) // PRICE_CHECKPOINT_EVERY + 1
+        self.checkpoints = np.full((n_checkpoints, PRICE_CHECKPOINT_TOP_K), -1, dtype=np.int64)
+        running = self.positions[:0]
+        for c in range(1, n_checkpoints):
+            chunk = self.positions[(c - 1) * PRICE_CHECKPOINT_EVERY:c * PRICE_CHECKPOINT_EVERY]
+            running = _best_value_first(np.concatenate((running, chunk)), value_scores)[:PRICE_CHECKPOINT_TOP_K]
+            self.checkpoints[c, :len(running)] = running
+
+    def best_value_below(self, price, top_n, value_scores, exclude):
+        """
+        Row positions of the top_n best-value products priced strictly below price.
+
+        Args:
+            exclude: Row positions that must not be returned
+        """
+        cheaper = int(np.searchsorted(self.prices, price, side='left'))
+        c = cheaper // PRICE_CHECKPOINT_EVERY
+        covered = c * PRICE_CHECKPOINT_EVERY
+        best = self.checkpoints[c]
+        best = best[best >= 0]
+        best = best[~np.isin(best, exclude)]
+        tail = self.positions[covered:cheaper]
+
+        # The checkpoint's top-k still holds the answer unless exclusions ate into it
+        if len(best) >= top_n or covered <= PRICE_CHECKPOINT_TOP_K:
+            candidates = np.concatenate((best, tail[~np.isin(tail, exclude)]))
+        else:
+            candidates = self.positions[:cheaper]
+            candidates = candidates[~np.isin(candidates, exclude)]
+        return _best_value_first(candidates, value_scores)[:top_n]
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Content hash of a file, used to tell whether saved models match the catalog."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class SimplifiedProductRecommender:
+    def __init__(self, csv_path, neighbour_k=DEFAULT_NEIGHBOUR_K):
+        """Initialize the recommender with product data from a CSV file."""
+        self.csv_path = csv_path
+        self.neighbour_k = neighbour_k
+        self.model_version = None
+
+        # Load data from CSV file
+        self.df = pd.read_csv(csv_path)
+        
+        # Ensure price and rating are numeric
+        self.df['price'] = pd.to_numeric(self.df['price'])
+        self.df['rating'] = pd.to_numeric(self.df['rating'])
+        
+        # Create a value score that balances price and rating
+        self.df['value_score'] = self.df['rating'] / self.df['price']
+
+        # Build lookup indexes over row positions
+        self._build_lookup_index()
+        
+        # Initialize models
+        self.similarity_features = None
+        self.neighbour_indices = None
+        self.neighbour_scores = None
+        self.prediction_model = None
+        self.is_trained = False
+        
+    def _build_lookup_index(self):
+        """Map product_id to its row position (first occurrence wins) and category to its row positions."""
+        product_ids = self.df['product_id']
+        first_rows = ~product_ids.duplicated().to_numpy()
+        self.product_positions = dict(zip(product_ids.to_numpy()[first_rows], np.flatnonzero(first_rows).tolist()))
+        repeated = product_ids.duplicated(keep=False).to_numpy()
+        self.repeated_product_positions = {
+            product_id: rows.to_numpy() for product_id, rows in
+            pd.Series(np.flatnonzero(repeated)).groupby(product_ids.to_numpy()[repeated], sort=False)
+        }
+        self.category_positions = self.df.groupby('category', sort=False).indices
+
+        prices = self.df['price'].to_numpy()
+        value_scores = self.df['value_score'].to_numpy()
+        self.price_tables = {category: CategoryPriceTable(positions, prices, value_scores)
+                             for category, positions in self.category_positions.items()}
+
+    def _locate(self, product_id):
+        """Row position of a product, or None if it is not in the catalog."""
+        return self.product_positions.get(product_id)
+
+    def train_models(self):
+        """Train the similarity model and prediction model for recommendations."""
+        # 1. Similarity-based model
+        self._train_similarity_model()
+        
+        # 2. Price-quality prediction model for customer satisfaction
+        self._train_prediction_model()
+        
+        self.is_trained = True
+        self.model_version = f"{file_sha256(self.csv_path)[:12]}-{int(time.time())}"
+        print("Models trained successfully.")
+        
+    def _train_similarity_model(self):
+        """Train a content-based similarity model."""
+        # Create feature matrix for similarity calculation
+        # Using category as a one-hot encoded feature
+        categories = pd.get_dummies(self.df['category'])
+        
+        # Create a price range feature (normalized)
+        scaler = StandardScaler()
+        price_scaled = scaler.fit_transform(self.df[['price']])
+        
+        # Combine features
+        features = np.hstack((categories.values, price_scaled, self.df[['rating']].values))
+        
+        # Unit-length rows, so cosine similarity is a plain dot product
+        self.similarity_features = normalize(features)
+
+        # Keep only the top-k neighbours per product instead of the full N x N matrix
+        k = self.neighbour_k if len(self.df) <= NEIGHBOUR_INDEX_MAX_ROWS else 0
+        self.neighbour_indices, self.neighbour_scores = self._top_neighbours(np.arange(len(self.df)), k)
+        
+        # Store category encodings for future use
+        self.category_features = categories.columns.tolist()
+        self.price_scaler = scaler
+        
+    def _top_neighbours(self, rows, k):
+        """
+        Find the k most similar products for each of the given row positions.
+
+        Scores are computed in blocks so at most SIMILARITY_BLOCK_ELEMENTS are
+        held at once. Each row is ordered by descending similarity with ties
+        broken by row position, and excludes the row itself.
+
+        Returns:
+            (indices, scores) arrays of shape (len(rows), k) as int32/float32
+        """
+        features = self.similarity_features
+        n = features.shape[0]
+        k = max(0, min(k, n - 1))
+        rows = np.asarray(rows, dtype=np.int64)
+        indices = np.empty((len(rows), k), dtype=np.int32)
+        scores = np.empty((len(rows), k), dtype=np.float32)
+        if k == 0:
+            return indices, scores
+
+        block = max(1, SIMILARITY_BLOCK_ELEMENTS // n)
+        for start in range(0, len(rows), block):
+            block_rows = rows[start:start + block]
+            block_scores = features[block_rows] @ features.T
+            block_scores[np.arange(len(block_rows)), block_rows] = -np.inf
+
+            # Unordered top-k per row, then order it by (-score, position)
+            candidates = np.argpartition(-block_scores, k - 1, axis=1)[:, :k]
+            candidate_scores = np.take_along_axis(block_scores, candidates, axis=1)
+
+            # argpartition picks arbitrarily among scores tied with the k-th best;
+            # redo those rows so the lowest positions win, as a stable sort would
+            kth_scores = candidate_scores.min(axis=1)
+            tied_total = (block_scores == kth_scores[:, None]).sum(axis=1)
+            tied_kept = (candidate_scores == kth_scores[:, None]).sum(axis=1)
+            for r in np.flatnonzero(tied_total != tied_kept):
+                above = np.flatnonzero(block_scores[r] > kth_scores[r])
+                tied = np.flatnonzero(block_scores[r] == kth_scores[r])[:k - len(above)]
+                candidates[r] = np.concatenate((above, tied))
+                candidate_scores[r] = block_scores[r, candidates[r]]
+
+            order = np.lexsort((candidates, -candidate_scores), axis=1)
+            indices[start:start + block] = np.take_along_axis(candidates, order, axis=1)
+            scores[start:start + block] = np.take_along_axis(candidate_scores, order, axis=1)
+        return indices, scores
+
+    def _train_prediction_model(self):
+        """Train a model to predict if a customer will like a product based on its attributes."""
+        # Features: price, category (one-hot encoded)
+        categories = pd.get_dummies(self.df['category'])
+        X = pd.concat([self.df[['price']], categories], axis=1)
+        
+        # Target: rating (we're assuming ratings represent user satisfaction)
+        y = self.df['rating']
+        
+        # Train model
+        self.prediction_model = RandomForestRegressor(n_estimators=100, random_state=42)
+        self.prediction_model.fit(X, y)
+
+        self._precompute_predicted_ratings()
+
+    def _prediction_features(self, positions):
+        """Build the price + one-hot category feature matrix for the given row positions."""
+        positions = np.asarray(positions, dtype=np.int64)
+        X = np.zeros((len(positions), 1 + len(self.category_features)))
+        X[:, 0] = self.df['price'].to_numpy()[positions]
+        columns = pd.Index(self.category_features).get_indexer(self.df['category'].to_numpy()[positions])
+        known = columns >= 0
+        X[np.flatnonzero(known), columns[known] + 1] = 1
+        return pd.DataFrame(X, columns=['price'] + self.category_features)
+
+    def _precompute_predicted_ratings(self):
+        """Run the forest once over the whole catalog and keep the result as a column."""
+        X = self._prediction_features(np.arange(len(self.df)))
+        self.df['predicted_rating'] = self.prediction_model.predict(X)
+        
+    def save_models(self, path="product_recommender_models"):
+        """Save trained models to disk, with a manifest tying them to the catalog CSV."""
+        if not os.path.exists(path):
+            os.makedirs(path)
+
+        # Drop the old manifest first so a half-written directory never looks valid
+        manifest_path = os.path.join(path, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+            
+        # Save similarity features and the top-k neighbour index
+        np.save(f"{path}/similarity_features.npy", self.similarity_features)
+        np.save(f"{path}/neighbour_indices.npy", self.neighbour_indices)
+        np.save(f"{path}/neighbour_scores.npy", self.neighbour_scores)
+        
+        # Save prediction model
+        joblib.dump(self.prediction_model, f"{path}/prediction_model.pkl")
+        
+        # Save scaler
+        joblib.dump(self.price_scaler, f"{path}/price_scaler.pkl")
+        
+        # Save category features
+        pd.Series(self.category_features).to_csv(f"{path}/category_features.csv", index=False)
+
+        # Write the manifest last; it marks the artifact set as complete
+        csv_sha256 = file_sha256(self.csv_path)
+        manifest = {
+            "format_version": ARTIFACT_FORMAT_VERSION,
+            "model_version": self.model_version,
+            "csv_sha256": csv_sha256,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "files": ARTIFACT_FILES,
+        }
+        with open(f"{manifest_path}.tmp", "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+        
+        print(f"Models saved to {path}")
+
+    def read_manifest(self, path="product_recommender_models"):
+        """Return the saved manifest if it is current for this catalog, else None."""
+        manifest_path = os.path.join(path, MANIFEST_FILE)
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if manifest.get("format_version") != ARTIFACT_FORMAT_VERSION:
+            print(f"Saved models use format {manifest.get('format_version')}, expected {ARTIFACT_FORMAT_VERSION}.")
+            return None
+        if manifest.get("csv_sha256") != file_sha256(self.csv_path):
+            print(f"Saved models are stale: {self.csv_path} changed since they were trained.")
+            return None
+        if not all(os.path.exists(os.path.join(path, name)) for name in manifest.get("files", [])):
+            print("Saved models are incomplete.")
+            return None
+        return manifest
+
+    def load_or_train(self, path="product_recommender_models"):
+        """
+        Warm start: load saved models if they are current for the catalog,
+        otherwise train from scratch and save them for the next start.
+
+        Returns:
+            True if models were loaded, False if they had to be retrained
+        """
+        if self.read_manifest(path) is not None and self.load_models(path):
+            return True
+
+        print("Training models from scratch.")
+        self.train_models()
+        self.save_models(path)
+        return False
+        
+    def load_models(self, path="product_recommender_models"):
+        """Load trained models from disk."""
+        if not os.path.exists(path):
+            print("Model path does not exist. Models need to be trained first.")
+            return False
+            
+        # Load similarity features and the top-k neighbour index
+        self.similarity_features = np.load(f"{path}/similarity_features.npy")
+        self.neighbour_indices = np.load(f"{path}/neighbour_indices.npy")
+        self.neighbour_scores = np.load(f"{path}/neighbour_scores.npy")
+        
+        # Load prediction model
+        self.prediction_model = joblib.load(f"{path}/prediction_model.pkl")
+        
+        # Load scaler
+        self.price_scaler = joblib.load(f"{path}/price_scaler.pkl")
+        
+        # Load category features
+        self.category_features = pd.read_csv(f"{path}/category_features.csv").iloc[:, 0].tolist()
+
+        self._precompute_predicted_ratings()
+
+        manifest_path = os.path.join(path, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                self.model_version = json.load(f).get("model_version")
+        
+        self.is_trained = True
+        print("Models loaded successfully.")
+        return True
+    
+    def get_similar_products(self, product_id, top_n=5):
+        """Find the most similar products to the given product."""
+        if not self.is_trained:
+            print("Models are not trained. Call train_models() first.")
+            return None
+            
+        # Find the product index
+        idx = self._locate(product_id)
+        if idx is None:
+            return f"Product {product_id} not found in database."
+            
+        # Return similar products
+        return self.df.iloc[self._similar_positions(idx, top_n)]
+
+    def _similar_positions(self, idx, top_n):
+        """
+        Row positions of the top_n products most similar to row idx (excluding itself),
+        from the precomputed index when it is deep enough.
+        """
+        if top_n <= self.neighbour_indices.shape[1]:
+            return self.neighbour_indices[idx, :top_n]
+        return self._top_neighbours([idx], top_n)[0][0]
+    
+    def predict_user_satisfaction(self, product_id):
+        """Predict how likely a user is to be satisfied with a product."""
+        if not self.is_trained or self.prediction_model is None:
+            print("Prediction model is not trained. Call train_models() first.")
+            return None
+            
+        # Find the product
+        idx = self._locate(product_id)
+        if idx is None:
+            return f"Product {product_id} not found in database."
+
+        # Predicted satisfaction (rating), precomputed for the whole catalog
+        return self.df['predicted_rating'].iat[idx]
+
+    def predict_user_satisfaction_batch(self, product_ids):
+        """
+        Predict user satisfaction for many products at once.
+
+        Args:
+            product_ids: Iterable of product IDs
+
+        Returns:
+            float array aligned with product_ids, NaN for unknown products
+        """
+        if not self.is_trained or self.prediction_model is None:
+            print("Prediction model is not trained. Call train_models() first.")
+            return None
+
+        positions = np.array([self.product_positions.get(pid, -1) for pid in product_ids], dtype=np.int64)
+        known = positions >= 0
+        predicted = np.full(len(positions), np.nan)
+        predicted[known] = self.df['predicted_rating'].to_numpy()[positions[known]]
+        return predicted
+    
+    def _basic_alternatives(self, idx, product_id, top_n):
+        """Row positions of the top_n best-value products cheaper than row idx in its category."""
+        table = self.price_tables.get(self.df['category'].iat[idx])
+        if table is None:
+            return np.empty(0, dtype=np.int64)
+
+        # Other rows sharing this product_id are never recommended
+        exclude = self.repeated_product_positions.get(product_id, [idx])
+        return table.best_value_below(self.df['price'].iat[idx], top_n, self.df['value_score'].to_numpy(), exclude)
+
+    def recommend_alternatives(self, product_id, top_n=3, method='basic'):
+        """
+        Recommend cheaper alternatives with good ratings for a given product.
+        
+        Args:
+            product_id: The ID of the scanned product
+            top_n: Number of recommendations to return
+            method: Recommendation method ('basic' or 'similar')
+            
+        Returns:
+            Dict with the original product and its recommended alternatives,
+            or a message string if there is nothing to recommend
+        """
+        return self.recommend_alternatives_batch([product_id], top_n=top_n, method=method)[product_id]
+
+    def recommend_alternatives_batch(self, product_ids, top_n=3, method='basic'):
+        """
+        Recommend cheaper alternatives for many products in one vectorized pass.
+
+        Args:
+            product_ids: IDs of the scanned products (e.g. every item on a receipt)
+            top_n: Number of recommendations to return per product
+            method: Recommendation method ('basic' or 'similar')
+
+        Returns:
+            Dict mapping each product_id to what recommend_alternatives() returns for it
+        """
+        results = {}
+        prices = self.df['price'].to_numpy()
+        product_names = self.df['product_name'].to_numpy()
+
+        # Pick the recommended rows for every product
+        targets = []
+        for product_id in dict.fromkeys(product_ids):
+            idx = self._locate(product_id)
+            if idx is None:
+                results[product_id] = f"Product {product_id} not found in database."
+                continue
+
+            if method == 'basic':
+                # Best value scores among cheaper products in the category
+                positions = self._basic_alternatives(idx, product_id, top_n)
+                if len(positions) == 0:
+                    results[product_id] = f"No cheaper alternatives found for {product_names[idx]}."
+                    continue
+
+            elif method == 'similar' and self.is_trained:
+                # Cheaper products among the 10 most similar
+                similar = self._similar_positions(idx, 10)
+                positions = similar[prices[similar] < prices[idx]][:top_n]
+                if len(positions) == 0:
+                    results[product_id] = f"No cheaper similar alternatives found for {product_names[idx]}."
+                    continue
+
+            else:
+                results[product_id] = "Invalid method or models not trained. Choose 'basic' or 'similar'."
+                continue
+
+            targets.append((product_id, idx, positions))
+
+        if not targets:
+            return results
+
+        # Gather all recommended rows at once
+        counts = [len(positions) for _, _, positions in targets]
+        positions = np.concatenate([positions for _, _, positions in targets])
+        target_rows = np.repeat([idx for _, idx, _ in targets], counts)
+        rec_ids = self.df['product_id'].to_numpy()[positions]
+        ratings = self.df['rating'].to_numpy()
+
+        # Calculate savings and value improvement
+        price_savings = prices[target_rows] - prices[positions]
+        columns = {
+            'product_id': rec_ids,
+            'product_name': product_names[positions],
+            'price': prices[positions],
+            'rating': ratings[positions],
+            'price_savings': price_savings,
+            'price_savings_pct': np.round(price_savings / prices[target_rows] * 100, 1),
+            'rating_diff': np.round(ratings[positions] - ratings[target_rows], 1),
+        }
+
+        # Add predicted user satisfaction if available
+        if self.is_trained and self.prediction_model is not None:
+            columns['predicted_rating'] = self.predict_user_satisfaction_batch(rec_ids)
+
+        # Format the output for better readability
+        records = [dict(zip(columns, row)) for row in zip(*(values.tolist() for values in columns.values()))]
+        start = 0
+        for (product_id, idx, _), count in zip(targets, counts):
+            target_product = self.df.iloc[idx]
+            results[product_id] = {
+                'original_product': {
+                    'product_id': target_product['product_id'],
+                    'product_name': target_product['product_name'],
+                    'category': target_product['category'],
+                    'price': target_product['price'],
+                    'rating': target_product['rating']
+                },
+                'recommendations': records[start:start + count]
+            }
+            start += count
+
+        return results
+    
+    def scan_product(self, product_id, method='basic'):
+        """Simulate scanning a product and getting recommendations."""
+        recommendations = self.recommend_alternatives(product_id, method=method)
+        
+        if isinstance(recommendations, str):
+            return recommendations
+        
+        original = recommendations['original_product']
+        recs = recommendations['recommendations']
+        
+        print(f"Scanned Product: {original['product_name']} (₹{float(original['price']):.2f}, Rating: {original['rating']})")
+        print(f"Category: {original['category']}")
+        print(f"Recommendation Method: {method}")
+        print("\nRecommended Alternatives:")
+        
+        for i, rec in enumerate(recs, 1):
+            price_diff = float(rec['price_savings'])
+            price_diff_pct = float(rec['price_savings_pct'])
+            rating_diff = float(rec['rating_diff'])
+            
+            rating_indicator = "↑" if rating_diff > 0 else "↓"
+            if rating_diff == 0:
+                rating_indicator = "="
+                
+            print(f"{i}. {rec['product_name']} - ₹{float(rec['price']):.2f} (Save ₹{price_diff:.2f}, {price_diff_pct}%)")
+            print(f"   Rating: {rec['rating']} {rating_indicator}")
+            
+            if 'predicted_rating' in rec:
+                pred_rating = float(rec['predicted_rating'])
+                print(f"   Predicted Satisfaction: {pred_rating:.1f}/5.0")
+                
+            print()
+            
+        return recommendations
+
+# Example usage
+if __name__ == "__main__":
+    csv_path = "category.csv"  # Replace with the path to your actual CSV file
+    
+    # Create the simplified recommender
+    recommender = SimplifiedProductRecommender(csv_path)
+    
+    # Train the models
+    recommender.train_models()
+    
+    # Save models for future use
+    recommender.save_models()
+    
+    # Or load pre-trained models
+    recommender.load_models()
+    
+    # Example recommendations with different methods
+    print("BASIC RECOMMENDATIONS:")
+    recommender.scan_product('HO_7443', method='basic')
+    
+    print("\nSIMILARITY-BASED RECOMMENDATIONS:")
     recommender.scan_product('HO_7443', method='similar')
\ No newline at end of file
@@ -0,0 +1,78 @@
+# bench_classifier.py
+# Micro-benchmark: compiled KeywordClassifier vs. the old nested category loop,
+# on the sample OCR receipt (`ocr_text`) from the top-level main.py.
+# To run: python benchmarks/bench_classifier.py [--repeat 2000]
+import argparse
+import ast
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "BackendFastapi"))
+
+from keyword_classifier import KeywordClassifier  # noqa: E402
+from main import PRODUCT_CATEGORIES, extract_and_classify_products  # noqa: E402
+
+
+def load_sample_receipt() -> str:
+    """Reads the `ocr_text` literal from the top-level main.py without executing that script."""
+    with open(os.path.join(ROOT, "main.py"), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "ocr_text" for t in node.targets):
+            return ast.literal_eval(node.value)
+    raise RuntimeError("ocr_text not found in main.py")
+
+
+def legacy_classify(product_name: str) -> str:
+    """The classification loop as it was before KeywordClassifier."""
+    product_category = "Others"
+    product_name_upper = product_name.upper()
+    for category, keywords in PRODUCT_CATEGORIES.items():
+        if category == "Others":
+            continue
+        if any(f" {keyword} " in f" {product_name_upper} " or
+               product_name_upper.endswith(f" {keyword}") or
+               product_name_upper.startswith(f"{keyword} ") or
+               product_name_upper == keyword for keyword in keywords):
+            product_category = category
+            break
+    return product_category
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=2000, help="Passes over the receipt per timing run")
+    args = parser.parse_args()
+
+    names = [item.name for item in extract_and_classify_products(load_sample_receipt())]
+    classifier = KeywordClassifier(PRODUCT_CATEGORIES)
+
+    mismatches = [(n, legacy_classify(n), classifier.classify(n)) for n in names
+                  if legacy_classify(n) != classifier.classify(n)]
+    if mismatches:
+        print(f"Classification mismatch: {mismatches}")
+        sys.exit(1)
+
+    def run_legacy():
+        for name in names:
+            legacy_classify(name)
+
+    def run_compiled():
+        for name in names:
+            classifier.classify(name)
+
+    legacy = min(timeit.repeat(run_legacy, number=args.repeat, repeat=5))
+    compiled = min(timeit.repeat(run_compiled, number=args.repeat, repeat=5))
+    compile_time = min(timeit.repeat(classifier.compile, number=20, repeat=5)) / 20
+    per_line = 1e6 / (args.repeat * len(names))
+
+    print(f"Sample receipt: {len(names)} product lines, {args.repeat} passes")
+    print(f"  legacy loop : {legacy * per_line:8.2f} us/line")
+    print(f"  compiled    : {compiled * per_line:8.2f} us/line  ({legacy / compiled:.1f}x faster)")
+    print(f"  compile     : {compile_time * 1e3:8.3f} ms (once per keyword table change)")
+
+
+if __name__ == "__main__":
+    main()
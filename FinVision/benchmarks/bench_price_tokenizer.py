@@ -0,0 +1,101 @@
+# bench_price_tokenizer.py
+# Micro-benchmark: compiled rightmost-price tokenizer vs. the old
+# replace()/float()/ValueError loop, on the sample OCR receipt from the
+# top-level main.py and on a synthetic noisy OCR dump. Also fuzzes both
+# implementations against each other and exits non-zero on any difference.
+# To run: python benchmarks/bench_price_tokenizer.py [--noise-lines 5000] [--fuzz 200000]
+import argparse
+import os
+import random
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "BackendFastapi"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_classifier import load_sample_receipt  # noqa: E402
+from price_tokenizer import find_rightmost_price  # noqa: E402
+
+NOISE_TOKENS = ["TOTAL", "SUBTOTAL", "QTY", "x2", "@", "|", "--", "...", "#4471", "A1B2", "N/A", "VAT",
+                "12:45", "2024-01-07", "CARD****1234", "O.5O", "l.99", "$", "€", "Rs.", "1O0", "*", "%"]
+FUZZ_ALPHABET = list("0123456789._+-eEinfatyINFATY$€£₹,xX ") + ["١", "٣", "²", "½", "ı", "İ", "\t", "\u00a0", "\u2003"]
+
+
+def legacy_name_and_price(line):
+    """The price search as it was in extract_and_classify_products before price_tokenizer."""
+    words = line.split()
+    for i in range(len(words) - 1, -1, -1):
+        cleaned_word = words[i].replace('$', '').replace('€', '').replace('£', '').replace('₹', '').replace(',', '').replace('-', '')
+        if cleaned_word and cleaned_word != '.':
+            try:
+                return ' '.join(words[:i]), float(cleaned_word)
+            except ValueError:
+                continue
+    return None, None
+
+
+def compiled_name_and_price(line):
+    start, price = find_rightmost_price(line)
+    if price is None:
+        return None, None
+    return ' '.join(line[:start].split()), price
+
+
+def noisy_receipt(lines: int, seed: int = 7) -> str:
+    """OCR-like dump: mostly noise tokens, some lines with a trailing price."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(lines):
+        words = [rng.choice(NOISE_TOKENS) for _ in range(rng.randint(2, 10))]
+        if rng.random() < 0.3:
+            words.append(f"${rng.uniform(0.5, 2500):,.2f}")
+        out.append(" ".join(words))
+    return "\n".join(out)
+
+
+def same(a, b) -> bool:
+    return a[0] == b[0] and (a[1] == b[1] or (a[1] != a[1] and b[1] != b[1]))  # nan == nan
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--noise-lines", type=int, default=5000, help="Lines in the synthetic noisy receipt")
+    parser.add_argument("--fuzz", type=int, default=200000, help="Random lines to cross-check")
+    parser.add_argument("--repeat", type=int, default=20, help="Passes per timing run")
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    fuzz_lines = ["".join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randint(1, 16))) for _ in range(args.fuzz)]
+    mismatches = [line for line in fuzz_lines if not same(legacy_name_and_price(line), compiled_name_and_price(line))]
+
+    datasets = {"sample receipt": load_sample_receipt(), "noisy OCR dump": noisy_receipt(args.noise_lines)}
+    for label, text in datasets.items():
+        lines = [line.strip() for line in text.strip().split('\n') if line.strip()]
+        mismatches += [line for line in lines if not same(legacy_name_and_price(line), compiled_name_and_price(line))]
+    if mismatches:
+        print(f"Price extraction mismatch: {mismatches[:20]}")
+        sys.exit(1)
+    print(f"Fuzzed {args.fuzz} lines: legacy and compiled tokenizer agree")
+
+    for label, text in datasets.items():
+        lines = [line.strip() for line in text.strip().split('\n') if line.strip()]
+
+        def run_legacy():
+            for line in lines:
+                legacy_name_and_price(line)
+
+        def run_compiled():
+            for line in lines:
+                compiled_name_and_price(line)
+
+        legacy = min(timeit.repeat(run_legacy, number=args.repeat, repeat=5))
+        compiled = min(timeit.repeat(run_compiled, number=args.repeat, repeat=5))
+        per_line = 1e6 / (args.repeat * len(lines))
+        print(f"{label}: {len(lines)} lines")
+        print(f"  legacy loop : {legacy * per_line:8.2f} us/line")
+        print(f"  compiled    : {compiled * per_line:8.2f} us/line  ({legacy / compiled:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+# load_parse_bill_during_insights.py
+# Load test: /parse-bill latency while /generate_insights/ calls are in flight.
+# Gemini is replaced by a local fake model that takes --llm-seconds per call, so
+# this runs offline. If an insights call blocks the event loop, /parse-bill
+# latency jumps to roughly --llm-seconds; when it doesn't, latency stays flat.
+# To run: python benchmarks/load_parse_bill_during_insights.py [--insights 8]
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "BackendFastapi"))
+
+import httpx  # noqa: E402
+import main  # noqa: E402
+from llm_gateway import LLMGateway  # noqa: E402
+
+SAMPLE_BILL = "Cottage Cheese 6.6\nChocolate Cookies 8.1\nChicken breasts 30\nToilet Paper 1.59\n"
+
+
+class FakeResponse:
+    text = '{"summary": "fake insights"}'
+
+
+class FakeModel:
+    """Stands in for genai.GenerativeModel; both call styles take llm_seconds."""
+    llm_seconds = 1.0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def generate_content(self, prompt, **kwargs):
+        time.sleep(self.llm_seconds)
+        return FakeResponse()
+
+    async def generate_content_async(self, prompt, **kwargs):
+        await asyncio.sleep(self.llm_seconds)
+        return FakeResponse()
+
+
+def summarize(latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[max(0, int(len(latencies) * 0.95) - 1)]
+    return f"p50 {statistics.median(latencies) * 1e3:7.1f} ms   p95 {p95 * 1e3:7.1f} ms   max {latencies[-1] * 1e3:7.1f} ms"
+
+
+async def time_parse_bills(client, count, interval):
+    """Sends /parse-bill on a fixed schedule; latency counts from the scheduled send time,
+    so time spent waiting for a blocked event loop is included."""
+    latencies = []
+    start = time.perf_counter()
+    for i in range(count):
+        scheduled = start + i * interval
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        response = await client.post("/parse-bill", json={"text": SAMPLE_BILL})
+        latencies.append(time.perf_counter() - scheduled)
+        response.raise_for_status()
+    return latencies
+
+
+async def run(args):
+    FakeModel.llm_seconds = args.llm_seconds
+    main.llm_gateway = LLMGateway(FakeModel, max_concurrency=args.insights)
+    main.api_key = "fake-key"
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+        idle = await time_parse_bills(client, args.requests, args.interval)
+
+        # Start the /parse-bill schedule first, then fire the insights calls into it
+        parse_bills = asyncio.create_task(time_parse_bills(client, args.requests, args.interval))
+        await asyncio.sleep(args.interval)
+        insights = [asyncio.create_task(client.post("/generate_insights/")) for _ in range(args.insights)]
+        loaded = await parse_bills
+        statuses = [r.status_code for r in await asyncio.gather(*insights)]
+
+    print(f"/parse-bill x{args.requests}, fake LLM call = {args.llm_seconds:.1f}s")
+    print(f"  idle                          : {summarize(idle)}")
+    print(f"  {args.insights:2d} insights in flight         : {summarize(loaded)}")
+    print(f"  /generate_insights/ statuses  : {sorted(set(statuses))}")
+
+    if max(loaded) > args.llm_seconds / 2:
+        print("FAIL: /parse-bill waited on an in-flight insights call (event loop blocked).")
+        return 1
+    return 0
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Load test /parse-bill during /generate_insights/")
+    parser.add_argument("--insights", type=int, default=8, help="Concurrent /generate_insights/ calls")
+    parser.add_argument("--requests", type=int, default=50, help="/parse-bill calls per phase")
+    parser.add_argument("--interval", type=float, default=0.02, help="Time between /parse-bill sends (s)")
+    parser.add_argument("--llm-seconds", type=float, default=1.0, help="Latency of each fake LLM call (s)")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main_cli()